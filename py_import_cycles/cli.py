@@ -15,7 +15,7 @@ from .files import get_outputs_file_paths, scan_packages
 from .graphs import make_graph
 from .log import logger, setup_logging
 from .modules import PyModule
-from .visitors import visit_py_module
+from .visitors import visit_py_modules
 
 
 def _parse_arguments() -> argparse.Namespace:
@@ -50,6 +50,14 @@ def _parse_arguments() -> argparse.Namespace:
         "--outputs-filename",
         help="outputs filename. If not set the current timestamp is used",
     )
+    parser.add_argument(
+        "--cache-folder",
+        help=(
+            "path to cache folder. If set unchanged Python files are not parsed again."
+            " Outdated entries are not removed, thus the folder grows over time and may be"
+            " deleted at any time"
+        ),
+    )
     parser.add_argument(
         "--graph",
         action="store_true",
@@ -106,18 +114,18 @@ def main() -> int:
         stats["num_of_modules"] = len(py_modules)
 
     logger.info("Visit and compute imports of py modules")
+    if cache_folder := (Path(args.cache_folder) if args.cache_folder else None):
+        cache_folder.mkdir(parents=True, exist_ok=True)
     py_modules_by_name = {p.name: p for p in py_modules}
+    py_modules_by_path = {str(p.path): p for p in py_modules}
 
     imports_by_py_module = {
         py_module: imports
-        for py_module in py_modules
-        if (
-            imports := sorted(
-                frozenset(visit_py_module(py_modules_by_name, py_module)),
-                key=lambda m: tuple(m.name.parts),
-                reverse=True,
-            )
+        for py_module, import_py_modules in visit_py_modules(
+            py_modules_by_name, py_modules_by_path, py_modules, cache_folder
         )
+        # Note: 'visit_py_modules' already yields each imported py module only once
+        if (imports := sorted(import_py_modules, key=lambda m: m.name.parts, reverse=True))
     }
 
     if args.stats:
@@ -5,6 +5,7 @@ from typing import Iterator, Mapping, Sequence, Set, TypeVar
 from networkx import DiGraph, find_cycle
 from networkx.exception import NetworkXNoCycle
 
+from .tarjan import strongly_connected_components
 from .type_defs import Comparable
 
 T = TypeVar("T", bound=Comparable)
@@ -24,8 +25,23 @@ def depth_first_search(graph: Mapping[T, Sequence[T]]) -> Iterator[tuple[T, ...]
         # ]
         return tuple(cyclic_edges[0][:-1] + tuple(ce[1] for ce in cyclic_edges[1:-1]))
 
-    G = DiGraph([(v, w) for v, vertices, in graph.items() for w in vertices])
-    for vertex in sorted(graph):
+    # Only vertices of non-trivial strongly connected components are part of cycles. Searching from
+    # any other vertex finds the same cycle as searching from the component it leads to, thus
+    # the other vertices are skipped.
+    cyclic_vertices = {v for scc in strongly_connected_components(graph) for v in scc}
+    # Vertices from which no cycle is reachable would be explored again and again by every single
+    # search without ever finding a cycle, thus they are not part of the graph at all.
+    vertices_reaching_cycles = _compute_vertices_reaching(graph, cyclic_vertices)
+    G = DiGraph(
+        [
+            (v, w)
+            for v, vertices, in graph.items()
+            if v in vertices_reaching_cycles
+            for w in vertices
+            if w in vertices_reaching_cycles
+        ]
+    )
+    for vertex in sorted(cyclic_vertices):
         try:
             cyclic_edges = find_cycle(G, source=vertex, orientation="original")
         except NetworkXNoCycle:
@@ -35,3 +51,19 @@ def depth_first_search(graph: Mapping[T, Sequence[T]]) -> Iterator[tuple[T, ...]
             known_cycles.add(cycle)
             known_cycles.add(cycle[::-1])
             yield cycle
+
+
+def _compute_vertices_reaching(graph: Mapping[T, Sequence[T]], targets: Set[T]) -> Set[T]:
+    predecessors: dict[T, list[T]] = {}
+    for v, vertices in graph.items():
+        for w in vertices:
+            predecessors.setdefault(w, []).append(v)
+
+    reaching = set(targets)
+    stack = list(targets)
+    while stack:
+        for v in predecessors.get(stack.pop(), []):
+            if v not in reaching:
+                reaching.add(v)
+                stack.append(v)
+    return reaching
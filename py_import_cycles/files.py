@@ -6,35 +6,48 @@ from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
-from .modules import PyModule
+from .modules import PyModule, PyModuleType
 
 
 def scan_packages(packages: Sequence[Path]) -> Iterator[PyModule]:
-    paths_to_ignore: set[Path] = set()
     for package_path in packages:
-        for root, _dirs, files in os.walk(package_path):
+        for root, dirs, files in os.walk(package_path):
             root_path = Path(root)
 
             if root_path.name.startswith(".") or root_path.name == "__pycache_":
-                paths_to_ignore.add(root_path)
-                continue
-
-            if any(root_path.is_relative_to(p) for p in paths_to_ignore):
+                # Do not descend into this folder at all
+                dirs.clear()
                 continue
 
+            # 'os.walk' already separates files from folders, thus the types of the py modules are
+            # known without further stat calls.
             for file in files:
-                # May be a regular package or a module
-                file_path = root_path / file
+                if os.path.splitext(file)[1] != ".py":
+                    continue
+                # Files whose names are no valid module names, eg. 'my-module.py', are skipped
                 try:
-                    yield PyModule(package=package_path, path=file_path)
+                    yield PyModule(
+                        package=package_path,
+                        path=root_path / file,
+                        py_module_type=(
+                            PyModuleType.REGULAR_PACKAGE
+                            if file == "__init__.py"
+                            else PyModuleType.MODULE
+                        ),
+                    )
                 except ValueError:
                     pass
 
-            # May be a namespace package
-            try:
-                yield PyModule(package=package_path, path=root_path)
-            except ValueError:
-                pass
+            if "__init__.py" not in files:
+                # Folders whose names are no valid module names, eg. 'my-dir', are skipped
+                try:
+                    yield PyModule(
+                        package=package_path,
+                        path=root_path,
+                        py_module_type=PyModuleType.NAMESPACE_PACKAGE,
+                    )
+                except ValueError:
+                    pass
 
 
 @dataclass(frozen=True, kw_only=True)
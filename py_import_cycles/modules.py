@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+import os
+import sys
 from enum import auto, Enum
+from functools import lru_cache
 from pathlib import Path
 from string import ascii_letters, digits
 from typing import Final
@@ -20,24 +22,45 @@ def _parse_part(part: str) -> str:
         raise ValueError(part[0])
     if not set(part[1:]).issubset(ascii_letters + digits + "_*"):
         raise ValueError(part[1:])
-    return part
+    # The same parts show up in many module names, eg. the package names
+    return sys.intern(part)
 
 
 class ModuleName:
     """This class is inspired by pathlib.Path"""
 
+    __slots__ = ("_parts", "_hash")
+
+    _parts: tuple[str, ...]
+    _hash: int
+
     def __init__(self, *parts: str | ModuleName) -> None:
-        self._parts: Final[tuple[str, ...]] = tuple(
-            _parse_part(entry)
-            for part in parts
-            for entry in (part.parts if isinstance(part, ModuleName) else part.split("."))
+        self._set_parts(
+            tuple(
+                _parse_part(entry)
+                for part in parts
+                for entry in (part.parts if isinstance(part, ModuleName) else part.split("."))
+            )
         )
 
+    def _set_parts(self, parts: tuple[str, ...]) -> None:
+        self._parts = parts
+        # Module names are used as keys in lookups all over the place
+        self._hash = hash(parts)
+
+    @classmethod
+    def from_parts(cls, parts: tuple[str, ...]) -> ModuleName:
+        # Note: The parts are neither split nor validated. Use this only with parts which are
+        # already valid, eg. taken from another module name or from an AST.
+        module_name = cls.__new__(cls)
+        module_name._set_parts(parts)
+        return module_name
+
     def __str__(self) -> str:
         return ".".join(self._parts)
 
     def __hash__(self) -> int:
-        return hash(self._parts)
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, ModuleName):
@@ -55,21 +78,26 @@ class ModuleName:
         return self._parts > other._parts
 
     def __le__(self, other: object) -> bool:
-        return self < other or self == other
+        if not isinstance(other, ModuleName):
+            return NotImplemented
+        return self._parts <= other._parts
 
     def __ge__(self, other: object) -> bool:
-        return self > other or self == other
+        if not isinstance(other, ModuleName):
+            return NotImplemented
+        return self._parts >= other._parts
 
     @property
-    def parts(self) -> Sequence[str]:
+    def parts(self) -> tuple[str, ...]:
         return self._parts
 
     @property
     def parent(self) -> ModuleName:
-        return ModuleName(*self._parts[:-1])
+        return ModuleName.from_parts(self._parts[:-1])
 
     def joinname(self, *names: str | ModuleName) -> ModuleName:
-        return ModuleName(*self._parts, *names)
+        # The own parts are already valid, only the new names have to be split and validated
+        return ModuleName.from_parts(self._parts + ModuleName(*names).parts)
 
 
 class PyModuleType(Enum):
@@ -89,22 +117,36 @@ def _compute_py_module_type(path: Path) -> PyModuleType:
     raise ValueError(path)
 
 
+@lru_cache(maxsize=None)
+def _make_package_module_name(package: Path) -> ModuleName:
+    # All py modules of a package share the same first part
+    return ModuleName(package.name)
+
+
 def _compute_py_module_name(package: Path, path: Path, py_module_type: PyModuleType) -> ModuleName:
-    module_name = ModuleName(package.name)
-    ref_path = path.parent if py_module_type is PyModuleType.REGULAR_PACKAGE else path
-    if not ref_path.is_relative_to(package) or (rel_path := ref_path.relative_to(package)) == Path(
-        "."
-    ):
+    module_name = _make_package_module_name(package)
+    ref_path = str(path.parent if py_module_type is PyModuleType.REGULAR_PACKAGE else path)
+    # Plain string operations are much cheaper than 'Path.is_relative_to' and 'Path.relative_to'.
+    # The prefix ends with a separator, thus 'ref_path' is a real sub path of 'package'.
+    if not ref_path.startswith(prefix := os.path.join(package, "")):
         return module_name
-    return module_name.joinname(*rel_path.with_suffix("").parts)
+    return module_name.joinname(*os.path.splitext(ref_path[len(prefix) :])[0].split(os.sep))
 
 
 class PyModule:
-    def __init__(self, package: Path, path: Path) -> None:
+    __slots__ = ("package", "path", "type", "name", "_hash")
+
+    def __init__(
+        self, package: Path, path: Path, py_module_type: PyModuleType | None = None
+    ) -> None:
+        # The type may be passed if already known, eg. from 'os.walk', which saves the stat calls
         self.package: Final[Path] = package
         self.path: Final[Path] = path
-        self.type: Final[PyModuleType] = _compute_py_module_type(path)
+        self.type: Final[PyModuleType] = (
+            _compute_py_module_type(path) if py_module_type is None else py_module_type
+        )
         self.name: Final[ModuleName] = _compute_py_module_name(package, path, self.type)
+        self._hash: Final[int] = hash(path)
 
     def __str__(self) -> str:
         match self.type:
@@ -116,7 +158,7 @@ class PyModule:
                 return f"{self.name}"
 
     def __hash__(self) -> int:
-        return hash(self.path)
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, PyModule):
@@ -134,7 +176,11 @@ class PyModule:
         return self.name > other.name
 
     def __le__(self, other: object) -> bool:
-        return self < other or self == other
+        if not isinstance(other, PyModule):
+            return NotImplemented
+        return self.name <= other.name
 
     def __ge__(self, other: object) -> bool:
-        return self > other or self == other
+        if not isinstance(other, PyModule):
+            return NotImplemented
+        return self.name >= other.name
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 
+from array import array
 from collections.abc import Hashable, Mapping, Sequence
-from typing import MutableMapping, Tuple, TypeVar
+from typing import Tuple, TypeVar
 
 T = TypeVar("T", bound=Hashable)
 
@@ -14,51 +15,109 @@ def strongly_connected_components(
     for finding the strongly connected components of a graph.
 
     Based on: http://en.wikipedia.org/wiki/Tarjan%27s_strongly_connected_components_algorithm
+
+    Note: Trivial strongly connected components, ie. single nodes without a self-loop, are not
+    part of the result because they cannot be part of a cycle.
     """
 
-    index_counter: list[int] = [0]
-    stack: list[T] = []
-    lowlinks: MutableMapping[T, int] = {}
-    index: MutableMapping[T, int] = {}
+    nodes, successors, offsets = _make_adjacency(graph)
+
+    # The auxiliary state is stored in 'array("i")' and 'bytearray' buffers, too: 4 bytes and
+    # 1 byte per node instead of a pointer to an int object.
+    index_counter = 0
+    stack = array("i")
+    # Membership tests on the stack are linear, keep track of its entries: One byte per node
+    # is more compact and cheaper to test than a set
+    on_stack = bytearray(len(nodes))
+    # -1: Not yet visited
+    lowlinks = array("i", [-1]) * len(nodes)
+    index = array("i", [-1]) * len(nodes)
     result: list[Tuple[T, ...]] = []
 
-    def strongconnect(node: T) -> None:
+    # Note: The recursion of the textbook algorithm is replaced by an explicit stack of the nodes
+    # being visited and the position of their next successor. This saves a Python frame per node
+    # and deep graphs do not hit the recursion limit.
+    for root in range(len(graph)):
+        if lowlinks[root] != -1:
+            continue
+
         # set the depth index for this node to the smallest unused index
-        index[node] = index_counter[0]
-        lowlinks[node] = index_counter[0]
-        index_counter[0] += 1
-        stack.append(node)
-
-        # Consider successors of `node`
-        try:
-            successors = graph[node]
-        except KeyError:
-            successors = []
-        for successor in successors:
-            if successor not in lowlinks:
-                # Successor has not yet been visited; recurse on it
-                strongconnect(successor)
-                lowlinks[node] = min(lowlinks[node], lowlinks[successor])
-            elif successor in stack:
-                # the successor is in the stack and hence in the current
-                # strongly connected component (SCC)
-                lowlinks[node] = min(lowlinks[node], index[successor])
-
-        # If `node` is a root node, pop the stack and generate an SCC
-        if lowlinks[node] == index[node]:
-            connected_component = []
-
-            while True:
-                successor = stack.pop()
-                connected_component.append(successor)
-                if successor == node:
-                    break
-            component = tuple(connected_component)
-            # storing the result
-            result.append(component)
-
-    for node in graph:
-        if node not in lowlinks:
-            strongconnect(node)
+        index[root] = lowlinks[root] = index_counter
+        index_counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        call_stack: list[tuple[int, int]] = [(root, offsets[root])]
+
+        while call_stack:
+            node, position = call_stack[-1]
+
+            # Consider successors of `node`
+            if position < offsets[node + 1]:
+                call_stack[-1] = (node, position + 1)
+                successor = successors[position]
+                if lowlinks[successor] == -1:
+                    # Successor has not yet been visited; descend into it
+                    index[successor] = lowlinks[successor] = index_counter
+                    index_counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = 1
+                    call_stack.append((successor, offsets[successor]))
+                elif on_stack[successor]:
+                    # the successor is in the stack and hence in the current
+                    # strongly connected component (SCC)
+                    lowlinks[node] = min(lowlinks[node], index[successor])
+                continue
+
+            # All successors are visited
+            call_stack.pop()
+
+            # If `node` is a root node, pop the stack and generate an SCC
+            if lowlinks[node] == index[node]:
+                if stack[-1] == node and node not in successors[offsets[node] : offsets[node + 1]]:
+                    # trivial SCCs without self-loop, ie. no cycle, are skipped
+                    stack.pop()
+                    on_stack[node] = 0
+                else:
+                    result.append(_pop_connected_component(nodes, stack, on_stack, node))
+
+            if call_stack:
+                # Back in the predecessor of `node`
+                lowlinks[call_stack[-1][0]] = min(lowlinks[call_stack[-1][0]], lowlinks[node])
 
     return result
+
+
+def _make_adjacency(graph: Mapping[T, Sequence[T]]) -> tuple[list[T], array, array]:
+    # The algorithm works on integer ids of the nodes: The nodes are hashed only once and all
+    # lookups in the hot loop are plain list indexing.
+    nodes: list[T] = list(graph)
+    ids: dict[T, int] = {node: id_ for id_, node in enumerate(nodes)}
+    for successors_of_node in graph.values():
+        for successor_of_node in successors_of_node:
+            if successor_of_node not in ids:
+                ids[successor_of_node] = len(nodes)
+                nodes.append(successor_of_node)
+    # The successors of all nodes are stored in one flat array (compressed sparse rows): The
+    # successors of the node 'n' are 'successors[offsets[n]:offsets[n + 1]]'. This needs a fraction
+    # of the memory of one list per node.
+    successors = array("i")
+    offsets = array("i", [0])
+    for successors_of_node in graph.values():
+        successors.extend([ids[s] for s in successors_of_node])
+        offsets.append(len(successors))
+    # Nodes which are only successors do not have successors themselves
+    offsets.extend([len(successors)] * (len(nodes) - len(graph)))
+    return nodes, successors, offsets
+
+
+def _pop_connected_component(
+    nodes: Sequence[T], stack: array, on_stack: bytearray, node: int
+) -> Tuple[T, ...]:
+    # The SCC of `node` consists of the nodes on the stack down to `node` itself
+    connected_component = []
+    while True:
+        successor = stack.pop()
+        on_stack[successor] = 0
+        connected_component.append(nodes[successor])
+        if successor == node:
+            return tuple(connected_component)
@@ -10,5 +10,9 @@ class Comparable(Protocol):
     @abc.abstractmethod
     def __lt__(self: T, other: T) -> bool: ...
 
+    # The vertices of graphs are also used as keys
+    @abc.abstractmethod
+    def __hash__(self) -> int: ...
+
 
 T = TypeVar("T", bound=Comparable)
@@ -1,43 +1,89 @@
 #!/usr/bin/env python3
 
 import ast
+import hashlib
+import marshal
+import os
+import re
 import sys
-from collections.abc import Iterator, Mapping, Sequence
-from dataclasses import dataclass
+from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import NamedTuple
 
 from .log import logger
 from .modules import ModuleName, PyModule, PyModuleType
 
-STDLIB_OR_BUILTIN = sys.stdlib_module_names.union(sys.builtin_module_names)
+STDLIB_OR_BUILTIN: frozenset[str] = sys.stdlib_module_names.union(sys.builtin_module_names)
 ImportSTMT = ast.Import | ast.ImportFrom
 
+# Below this number of py modules the files are parsed in the main process, see 'visit_py_modules'
+_MIN_PY_MODULES_FOR_WORKERS = 20
 
-@dataclass(frozen=True)
-class _AbsImportStmt:
+# Part of the cache keys, see '_compute_cache_path'. Increase it if the cached records change.
+_CACHE_VERSION = 1
+
+# Rough approximation of import statements: May also match comments or strings but does not miss
+# any real import statement. Blanks and backslash continuations may show up between all tokens,
+# eg. 'from pkg \<newline> import x' or 'from . . a import x', and 'from' needs no blank before
+# a dot, eg. 'from.a import x'. The files are not decoded, thus the bytes of non-ASCII characters
+# are part of names, too.
+_IMPORT_RE = re.compile(
+    rb"\b(?:from\b((?:[\w\x80-\xff. \t]|\\\r?\n)*?)\bimport\b"
+    rb"|import(?:[ \t]|\\\r?\n)+((?:[\w\x80-\xff., \t]|\\\r?\n)+))"
+)
+
+
+# Note: These records are created for every single import statement and only read afterwards.
+# Named tuples are cheaper to create, smaller and faster to unpack than (frozen) dataclasses. The
+# invariants (module is set for absolute 'from' imports, level >= 1 for relative ones) are
+# guaranteed by the grammar and by 'NodeVisitorImports.walk'.
+
+
+class _AbsImportStmt(NamedTuple):
     names: tuple[str, ...]
 
 
-@dataclass(frozen=True)
-class _AbsImportFromStmt:
+class _AbsImportFromStmt(NamedTuple):
     module: str
     names: tuple[str, ...]
 
-    def __post_init__(self) -> None:
-        assert self.module
-
 
-@dataclass(frozen=True)
-class _RelImportFromStmt:
+class _RelImportFromStmt(NamedTuple):
     level: int
-    module: str
+    # Only used to compute paths, thus the module is stored already split
+    module_parts: tuple[str, ...]
     names: tuple[str, ...]
 
-    def __post_init__(self) -> None:
-        assert self.level >= 1
-
 
-class NodeVisitorImports(ast.NodeVisitor):
+# The import statement records as plain tuples, see 'NodeVisitorImports.dump'
+_DumpedImportStmts = tuple[tuple[tuple, ...], tuple[tuple, ...], tuple[tuple, ...]]
+
+
+# Statement types which contain other statements mapped to the attributes holding them. Imports
+# are statements and cannot be nested in expressions, thus only these attributes are traversed.
+_STMT_FIELDS: dict[type[ast.AST], tuple[str, ...]] = {
+    ast.Module: ("body",),
+    ast.FunctionDef: ("body",),
+    ast.AsyncFunctionDef: ("body",),
+    ast.ClassDef: ("body",),
+    ast.For: ("body", "orelse"),
+    ast.AsyncFor: ("body", "orelse"),
+    ast.While: ("body", "orelse"),
+    ast.If: ("body", "orelse"),
+    ast.With: ("body",),
+    ast.AsyncWith: ("body",),
+    ast.Try: ("body", "handlers", "orelse", "finalbody"),
+    ast.ExceptHandler: ("body",),
+    ast.Match: ("cases",),
+    ast.match_case: ("body",),
+}
+if sys.version_info >= (3, 11):
+    _STMT_FIELDS[ast.TryStar] = ("body", "handlers", "orelse", "finalbody")
+
+
+class NodeVisitorImports:
     def __init__(self) -> None:
         self._abs_import_stmts: list[_AbsImportStmt] = []
         self._abs_import_from_stmts: list[_AbsImportFromStmt] = []
@@ -55,38 +101,66 @@ class NodeVisitorImports(ast.NodeVisitor):
     def rel_import_from_stmts(self) -> Sequence[_RelImportFromStmt]:
         return self._rel_import_from_stmts
 
-    def visit_Import(self, node: ast.Import) -> None:
-        self._abs_import_stmts.append(
-            _AbsImportStmt(
-                tuple(a.name for a in node.names),
-            )
+    def dump(self) -> _DumpedImportStmts:
+        # 'marshal' only supports plain tuples, not named tuples
+        return (
+            tuple(tuple(s) for s in self._abs_import_stmts),
+            tuple(tuple(s) for s in self._abs_import_from_stmts),
+            tuple(tuple(s) for s in self._rel_import_from_stmts),
         )
 
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-        if node.level >= 1:
-            self._rel_import_from_stmts.append(
-                _RelImportFromStmt(
-                    node.level,
-                    node.module or "",
-                    tuple(a.name for a in node.names),
-                )
-            )
-        else:
-            self._abs_import_from_stmts.append(
-                _AbsImportFromStmt(
-                    node.module or "",
-                    tuple(a.name for a in node.names),
-                )
-            )
+    @classmethod
+    def load(cls, dumped: _DumpedImportStmts) -> "NodeVisitorImports":
+        abs_import_stmts, abs_import_from_stmts, rel_import_from_stmts = dumped
+        visitor = cls()
+        visitor._abs_import_stmts = [_AbsImportStmt(*s) for s in abs_import_stmts]
+        visitor._abs_import_from_stmts = [_AbsImportFromStmt(*s) for s in abs_import_from_stmts]
+        visitor._rel_import_from_stmts = [_RelImportFromStmt(*s) for s in rel_import_from_stmts]
+        return visitor
+
+    def walk(self, tree: ast.AST) -> None:
+        # Note: The generic 'ast.NodeVisitor' dispatch visits every expression node, too. Here
+        # only statements are traversed, see '_STMT_FIELDS'.
+        # Note: The node types are concrete leaf types, thus plain identity checks are used instead
+        # of 'isinstance'.
+        stack: list[ast.AST] = [tree]
+        while stack:
+            node = stack.pop()
+            # Note: Building the tuples of names from lists is faster than from generators.
+            if type(node) is ast.Import:  # pylint: disable=unidiomatic-typecheck
+                # pylint: disable-next=consider-using-generator
+                self._abs_import_stmts.append(_AbsImportStmt(tuple([a.name for a in node.names])))
+            elif type(node) is ast.ImportFrom:  # pylint: disable=unidiomatic-typecheck
+                # pylint: disable-next=consider-using-generator
+                names = tuple([a.name for a in node.names])
+                if node.level >= 1:
+                    self._rel_import_from_stmts.append(
+                        _RelImportFromStmt(
+                            node.level, tuple(node.module.split(".")) if node.module else (), names
+                        )
+                    )
+                else:
+                    self._abs_import_from_stmts.append(_AbsImportFromStmt(node.module or "", names))
+            elif (fields := _STMT_FIELDS.get(type(node))) is not None:
+                for field in fields:
+                    stack.extend(getattr(node, field))
+
+
+@lru_cache(maxsize=None)
+def _make_module_name(name: str) -> ModuleName:
+    # The same modules are imported over and over again across the py modules, thus parse and
+    # validate each dotted name only once and share the resulting module name.
+    return ModuleName(name)
 
 
 def _compute_py_module_from_module_name(
     py_modules_by_name: Mapping[ModuleName, PyModule], module_name: ModuleName
-) -> Iterator[PyModule]:
-    if not module_name.parts or module_name.parts[0] in STDLIB_OR_BUILTIN:
-        return
+) -> PyModule | None:
+    # Note: Imports of stdlib or builtin modules are already filtered out by the callers
+    if not (parts := module_name.parts):
+        return None
 
-    if module_name.parts[-1] == "*":
+    if parts[-1] == "*":
         # Note:
         # from a.b import *
         # - If a.b is a pkg everything from a.b.__init__.py is loaded
@@ -94,140 +168,338 @@ def _compute_py_module_from_module_name(
         # -> Getting the "right" filepath is already handled below
         module_name = module_name.parent
 
-    if import_py_module := py_modules_by_name.get(module_name):
-        yield import_py_module
-
-
-def _compute_py_module_from_abs_import_stmt(
-    py_modules_by_name: Mapping[ModuleName, PyModule], abs_import_stmt: _AbsImportStmt
-) -> Iterator[PyModule]:
-    # https://docs.python.org/3/reference/simple_stmts.html#import
-    # import foo                 # foo imported and bound locally
-    # import foo.bar.baz         # foo, foo.bar, and foo.bar.baz imported, foo bound locally
-    # import foo.bar.baz as fbb  # foo, foo.bar, and foo.bar.baz imported, foo.bar.baz bound as fbb
-    for name in abs_import_stmt.names:
-        yield from _compute_py_module_from_module_name(py_modules_by_name, ModuleName(name))
+    return py_modules_by_name.get(module_name)
 
 
 def _compute_py_module_from_abs_import_from_stmt(
     py_modules_by_name: Mapping[ModuleName, PyModule],
     abs_import_from_stmt: _AbsImportFromStmt,
-) -> Iterator[PyModule]:
+) -> Sequence[PyModule]:
     # https://docs.python.org/3/reference/simple_stmts.html#import
     # from foo.bar import baz    # foo, foo.bar, and foo.bar.baz imported, foo.bar.baz bound as baz
     # from foo import attr       # foo imported and foo.attr bound as attr
-    anchor = ModuleName(abs_import_from_stmt.module)
+    if abs_import_from_stmt.module.partition(".")[0] in STDLIB_OR_BUILTIN:
+        # Checking the top-level name is enough, no need to make any module name
+        return []
+
+    anchor = _make_module_name(abs_import_from_stmt.module)
+    # The names are identifiers (or '*'), no need to split and validate them again
+    anchor_parts = anchor.parts
     import_py_modules = [
         import_py_module
         for name in abs_import_from_stmt.names
-        for import_py_module in _compute_py_module_from_module_name(
-            py_modules_by_name, anchor.joinname(name)
+        if (
+            import_py_module := _compute_py_module_from_module_name(
+                py_modules_by_name, ModuleName.from_parts(anchor_parts + (name,))
+            )
         )
+        is not None
     ]
-    yield from import_py_modules
 
-    if len(import_py_modules) != len(abs_import_from_stmt.names):
+    if len(import_py_modules) != len(abs_import_from_stmt.names) and (
         # from a.b import c, d
         # Check if c and d are modules or objects. If c or d is not a module then we have to
         # collect 'a.b'
-        yield from _compute_py_module_from_module_name(py_modules_by_name, anchor)
+        anchor_py_module := _compute_py_module_from_module_name(py_modules_by_name, anchor)
+    ):
+        import_py_modules.append(anchor_py_module)
+
+    return import_py_modules
 
 
 def _compute_ref_path_from_rel_import_from_stmt(
     base_py_module: PyModule, rel_import_from_stmt: _RelImportFromStmt
-) -> Path:
+) -> str:
     # Note: PyModuleType.NAMESPACE_PACKAGE are already excluded when calling 'visit_py_module'
     if base_py_module.type is PyModuleType.MODULE:
-        return base_py_module.path.parents[rel_import_from_stmt.level - 1]
+        num_parents = rel_import_from_stmt.level
     # PyModuleType.REGULAR_PACKAGE
-    if rel_import_from_stmt.level == 1:
-        return base_py_module.path.parent
-    return base_py_module.path.parents[rel_import_from_stmt.level - 2]
-
-
-def _compute_py_module_from_rel_import_from_stmt(base_py_module: PyModule, path: Path) -> PyModule:
-    if (module_file_path := path.with_suffix(".py")).exists():
-        return PyModule(package=base_py_module.package, path=module_file_path)
-    if (init_file_path := path / "__init__.py").exists():
-        return PyModule(package=base_py_module.package, path=init_file_path)
-    if path.is_dir():
-        return PyModule(package=base_py_module.package, path=path)
+    elif rel_import_from_stmt.level == 1:
+        num_parents = 1
+    else:
+        num_parents = rel_import_from_stmt.level - 1
+    # Plain string operations are much cheaper than building path objects via 'Path.parents'
+    ref_path = str(base_py_module.path)
+    for _ in range(num_parents):
+        ref_path = os.path.dirname(ref_path)
+    return ref_path
+
+
+def _compute_py_module_from_rel_import_from_stmt(
+    py_modules_by_path: Mapping[str, PyModule], path: str
+) -> PyModule:
+    # All py modules are already known from scanning the packages, no need to ask the file system
+    for candidate in (f"{path}.py", os.path.join(path, "__init__.py"), path):
+        if (py_module := py_modules_by_path.get(candidate)) is not None:
+            return py_module
     raise ValueError(path)
 
 
 def _compute_py_modules_from_rel_import_from_stmt(
-    base_py_module: PyModule, rel_import_from_stmt: _RelImportFromStmt
-) -> Iterator[PyModule]:
+    py_modules_by_path: Mapping[str, PyModule],
+    base_py_module: PyModule,
+    rel_import_from_stmt: _RelImportFromStmt,
+) -> Sequence[PyModule]:
     ref_path = _compute_ref_path_from_rel_import_from_stmt(base_py_module, rel_import_from_stmt)
+    import_py_modules: list[PyModule] = []
 
-    if rel_import_from_stmt.module:
-        ref_path = ref_path.joinpath(*ModuleName(rel_import_from_stmt.module).parts)
+    if rel_import_from_stmt.module_parts:
+        ref_path = os.path.join(ref_path, *rel_import_from_stmt.module_parts)
         try:
-            yield _compute_py_module_from_rel_import_from_stmt(base_py_module, ref_path)
+            import_py_modules.append(
+                _compute_py_module_from_rel_import_from_stmt(py_modules_by_path, ref_path)
+            )
         except ValueError:
             logger.debug("Cannot make py module from %s", ref_path)
 
     for name in rel_import_from_stmt.names:
         try:
-            yield _compute_py_module_from_rel_import_from_stmt(
-                base_py_module, ref_path.joinpath(name)
+            import_py_modules.append(
+                _compute_py_module_from_rel_import_from_stmt(
+                    py_modules_by_path, os.path.join(ref_path, name)
+                )
             )
         except ValueError:
             logger.debug("Cannot make py module from %s", ref_path)
 
+    return import_py_modules
+
+
+def _filter_valid_py_modules(
+    base_py_module: PyModule, candidates: Sequence[PyModule]
+) -> Sequence[PyModule]:
+    # The base py module is the same for all candidates, thus its parts are computed only once:
+    # - A py module does not import itself
+    # - Do not take 'foo.bar.baz imports foo.bar.__init__' into account; the package of the same
+    #   folder has the parent name
+    base_parts = base_py_module.name.parts
+    package_parts = base_parts[:-1] if base_py_module.type is PyModuleType.MODULE else None
+
+    import_py_modules: list[PyModule] = []
+    # A py module often imports the same py module several times, eg. 'from a import b' and
+    # 'from a import c' both result in 'a' if 'b' and 'c' are objects. Collect each one only once.
+    seen: set[PyModule] = {base_py_module}
+    for import_py_module in candidates:
+        if import_py_module in seen:
+            continue
+        seen.add(import_py_module)
+        if (parts := import_py_module.name.parts) == base_parts or (
+            parts == package_parts and import_py_module.type is PyModuleType.REGULAR_PACKAGE
+        ):
+            continue
+        import_py_modules.append(import_py_module)
 
-def _is_valid(base_py_module: PyModule, import_py_module: PyModule) -> bool:
-    if base_py_module == import_py_module:
-        return False
-    if (
-        base_py_module.type is PyModuleType.MODULE
-        and import_py_module.type is PyModuleType.REGULAR_PACKAGE
-        and base_py_module.path.parent == import_py_module.path.parent
-    ):
-        # Do not take 'foo.bar.baz imports foo.bar.__init__' into account
-        return False
-    return True
+    return import_py_modules
 
 
-def visit_py_module(
-    py_modules_by_name: Mapping[ModuleName, PyModule], base_py_module: PyModule
-) -> Iterator[PyModule]:
-    if base_py_module.type is PyModuleType.NAMESPACE_PACKAGE:
-        return
+def _get_top_level_names(py_modules_by_name: Mapping[ModuleName, PyModule]) -> frozenset[str]:
+    return frozenset(name.parts[0] for name in py_modules_by_name if name.parts)
+
+
+def _has_project_imports(top_level_names: Collection[str], content: bytes) -> bool:
+    for match in _IMPORT_RE.finditer(content):
+        if (from_module := match.group(1)) is not None:
+            from_module = from_module.replace(b"\\", b" ")
+            if from_module.lstrip().startswith(b"."):
+                return True
+            names = [from_module]
+        else:
+            names = match.group(2).replace(b"\\", b" ").split(b",")
+
+        for name in names:
+            if not (words := name.split()):
+                continue
+            if words[0].split(b".", 1)[0].decode("utf-8", "replace") in top_level_names:
+                return True
+    return False
 
+
+def _read_and_parse_py_module(
+    path: Path, top_level_names: Collection[str]
+) -> NodeVisitorImports | None:
+    # The content is not decoded here: 'compile' decodes the bytes itself and also takes encoding
+    # declarations into account.
     try:
-        with open(base_py_module.path, encoding="utf-8") as f:
+        with open(path, "rb") as f:
             content = f.read()
-    except UnicodeDecodeError as e:
-        logger.debug("Cannot read python file %s: %s", base_py_module.path, e)
-        return
+    except OSError as e:
+        logger.debug("Cannot read python file %s: %s", path, e)
+        return None
+
+    if not _has_project_imports(top_level_names, content):
+        # Only imports of stdlib or third-party modules, no need to parse the file
+        return None
 
     try:
-        tree = ast.parse(content)
-    except SyntaxError as e:
-        logger.debug("Cannot visit python file %s: %s", base_py_module.path, e)
-        return
+        tree = compile(content, str(path), "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+    except (SyntaxError, ValueError) as e:
+        logger.debug("Cannot visit python file %s: %s", path, e)
+        return None
 
     visitor = NodeVisitorImports()
-    visitor.visit(tree)
+    visitor.walk(tree)
+    return visitor
+
+
+def _compute_cache_path(cache_folder: Path, path: Path, top_level_names: Collection[str]) -> Path:
+    # The result of the pre-filter depends on the top-level names, thus they are part of the key.
+    # Whether a file can be parsed at all depends on the grammar of the Python version and the
+    # 'marshal' format may change between versions, too.
+    stat = os.stat(path)
+    key = "\0".join(
+        [
+            str(_CACHE_VERSION),
+            str(sys.version_info[:2]),
+            str(path),
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            *sorted(top_level_names),
+        ]
+    )
+    return cache_folder / hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _parse_py_module(
+    path: Path, top_level_names: Collection[str], cache_folder: Path | None = None
+) -> NodeVisitorImports | None:
+    # Note: This function is executed in worker processes, see 'visit_py_modules'. Thus arguments
+    # and the result must be picklable.
+    if cache_folder is None:
+        return _read_and_parse_py_module(path, top_level_names)
 
+    try:
+        cache_path = _compute_cache_path(cache_folder, path, top_level_names)
+    except OSError as e:
+        logger.debug("Cannot read python file %s: %s", path, e)
+        return None
+
+    try:
+        with open(cache_path, "rb") as f:
+            dumped = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    else:
+        return None if dumped is None else NodeVisitorImports.load(dumped)
+
+    visitor = _read_and_parse_py_module(path, top_level_names)
+
+    # Several worker processes or runs may write the same entry, thus replace it atomically
+    tmp_cache_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_cache_path, "wb") as f:
+            marshal.dump(None if visitor is None else visitor.dump(), f)
+        os.replace(tmp_cache_path, cache_path)
+    except OSError as e:
+        logger.debug("Cannot write cache file %s: %s", cache_path, e)
+
+    return visitor
+
+
+def _compute_py_modules_from_visitor(
+    py_modules_by_name: Mapping[ModuleName, PyModule],
+    py_modules_by_path: Mapping[str, PyModule],
+    base_py_module: PyModule,
+    visitor: NodeVisitorImports,
+) -> Sequence[PyModule]:
+    # Note: This is called for every single py module, thus the helpers return lists instead of
+    # stacking generator frames per import statement.
+    candidates: list[PyModule] = []
+    # https://docs.python.org/3/reference/simple_stmts.html#import
+    # import foo                 # foo imported and bound locally
+    # import foo.bar.baz         # foo, foo.bar, and foo.bar.baz imported, foo bound locally
+    # import foo.bar.baz as fbb  # foo, foo.bar, and foo.bar.baz imported, foo.bar.baz bound as fbb
+    # These are the most common import statements, thus they are resolved within this frame. Note:
+    # Wildcards are only allowed in 'from' imports.
+    stdlib_or_builtin = STDLIB_OR_BUILTIN
     for abs_import_stmt in visitor.abs_import_stmts:
-        for import_py_module in _compute_py_module_from_abs_import_stmt(
-            py_modules_by_name, abs_import_stmt
-        ):
-            if _is_valid(base_py_module, import_py_module):
-                yield import_py_module
+        for name in abs_import_stmt.names:
+            if name.partition(".")[0] in stdlib_or_builtin:
+                continue
+            if (import_py_module := py_modules_by_name.get(_make_module_name(name))) is not None:
+                candidates.append(import_py_module)
 
     for abs_import_from_stmt in visitor.abs_import_from_stmts:
-        for import_py_module in _compute_py_module_from_abs_import_from_stmt(
-            py_modules_by_name, abs_import_from_stmt
-        ):
-            if _is_valid(base_py_module, import_py_module):
-                yield import_py_module
-
+        candidates.extend(
+            _compute_py_module_from_abs_import_from_stmt(py_modules_by_name, abs_import_from_stmt)
+        )
     for rel_import_from_stmt in visitor.rel_import_from_stmts:
-        for import_py_module in _compute_py_modules_from_rel_import_from_stmt(
-            base_py_module, rel_import_from_stmt
-        ):
-            if _is_valid(base_py_module, import_py_module):
-                yield import_py_module
+        candidates.extend(
+            _compute_py_modules_from_rel_import_from_stmt(
+                py_modules_by_path, base_py_module, rel_import_from_stmt
+            )
+        )
+
+    return _filter_valid_py_modules(base_py_module, candidates)
+
+
+def visit_py_module(
+    py_modules_by_name: Mapping[ModuleName, PyModule],
+    py_modules_by_path: Mapping[str, PyModule],
+    base_py_module: PyModule,
+) -> Sequence[PyModule]:
+    # Use 'visit_py_modules' in order to visit many py modules
+    if base_py_module.type is PyModuleType.NAMESPACE_PACKAGE:
+        return []
+
+    if (
+        visitor := _parse_py_module(base_py_module.path, _get_top_level_names(py_modules_by_name))
+    ) is None:
+        return []
+
+    return _compute_py_modules_from_visitor(
+        py_modules_by_name, py_modules_by_path, base_py_module, visitor
+    )
+
+
+def _compute_imports_of_py_modules(
+    py_modules_by_name: Mapping[ModuleName, PyModule],
+    py_modules_by_path: Mapping[str, PyModule],
+    base_py_modules: Sequence[PyModule],
+    visitors: Iterable[NodeVisitorImports | None],
+) -> Iterator[tuple[PyModule, Sequence[PyModule]]]:
+    for base_py_module, visitor in zip(base_py_modules, visitors):
+        yield base_py_module, (
+            []
+            if visitor is None
+            else _compute_py_modules_from_visitor(
+                py_modules_by_name, py_modules_by_path, base_py_module, visitor
+            )
+        )
+
+
+def visit_py_modules(
+    py_modules_by_name: Mapping[ModuleName, PyModule],
+    py_modules_by_path: Mapping[str, PyModule],
+    base_py_modules: Sequence[PyModule],
+    cache_folder: Path | None = None,
+) -> Iterator[tuple[PyModule, Sequence[PyModule]]]:
+    # Reading and parsing the files is CPU bound and independent of each other, thus it's done in
+    # worker processes. Computing the imported py modules is cheap and needs the (large)
+    # 'py_modules_by_name' and 'py_modules_by_path' mappings, thus it's done here.
+    base_py_modules = [
+        py_module
+        for py_module in base_py_modules
+        if py_module.type is not PyModuleType.NAMESPACE_PACKAGE
+    ]
+    # Unchanged files are not read and parsed again if a cache folder is given
+    parse_py_module = partial(
+        _parse_py_module,
+        top_level_names=_get_top_level_names(py_modules_by_name),
+        cache_folder=cache_folder,
+    )
+    paths = [py_module.path for py_module in base_py_modules]
+
+    if len(paths) < _MIN_PY_MODULES_FOR_WORKERS:
+        # Starting the worker processes costs more than parsing a few files
+        yield from _compute_imports_of_py_modules(
+            py_modules_by_name, py_modules_by_path, base_py_modules, map(parse_py_module, paths)
+        )
+        return
+
+    with ProcessPoolExecutor() as executor:
+        yield from _compute_imports_of_py_modules(
+            py_modules_by_name,
+            py_modules_by_path,
+            base_py_modules,
+            executor.map(parse_py_module, paths, chunksize=64),
+        )
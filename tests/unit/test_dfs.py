@@ -65,6 +65,17 @@ from py_import_cycles.dfs import depth_first_search  # pylint: disable=import-er
                 ("c21", "c22"),
             ],
         ),
+        (
+            {
+                "a": ["x1", "b"],
+                "x1": ["x2"],
+                "x2": ["x3"],
+                "b": ["a"],
+            },
+            [
+                ("a", "b"),
+            ],
+        ),
     ],
 )
 def test_cycles_str(
@@ -30,6 +30,20 @@ def test_module_name_init_or_equal(parts: Sequence[str | ModuleName], expected:
     assert ModuleName(*parts) == expected
 
 
+@pytest.mark.parametrize(
+    "parts, expected",
+    [
+        ((), ModuleName()),
+        (("a",), ModuleName("a")),
+        (("a", "b"), ModuleName("a", "b")),
+    ],
+)
+def test_module_name_from_parts(parts: tuple[str, ...], expected: ModuleName) -> None:
+    module_name = ModuleName.from_parts(parts)
+    assert module_name == expected
+    assert hash(module_name) == hash(expected)
+
+
 @pytest.mark.parametrize(
     "module_name, expected",
     [
@@ -115,3 +129,18 @@ def test_py_module(tmp_path: Path) -> None:
     assert py_module.type is PyModuleType.MODULE
     assert py_module.name == ModuleName("package.module")
     assert str(py_module) == "package.module"
+
+
+@pytest.mark.parametrize(
+    "left, right, expected",
+    [
+        (ModuleName("a"), ModuleName("a"), (False, True, False, True)),
+        (ModuleName("a"), ModuleName("b"), (True, True, False, False)),
+        (ModuleName("a"), ModuleName("a", "b"), (True, True, False, False)),
+        (ModuleName("b"), ModuleName("a", "b"), (False, False, True, True)),
+    ],
+)
+def test_module_name_ordering(
+    left: ModuleName, right: ModuleName, expected: tuple[bool, bool, bool, bool]
+) -> None:
+    assert (left < right, left <= right, left > right, left >= right) == expected
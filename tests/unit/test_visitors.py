@@ -1,62 +1,233 @@
 #!/usr/bin/env python3
 
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from pathlib import Path
 
-from py_import_cycles.modules import ModuleName, PyModule  # pylint: disable=import-error
+import pytest
+
+from py_import_cycles.modules import (  # pylint: disable=import-error
+    ModuleName,
+    PyModule,
+    PyModuleType,
+)
 from py_import_cycles.visitors import (  # pylint: disable=import-error
     _AbsImportFromStmt,
+    _compute_cache_path,
     _compute_py_module_from_abs_import_from_stmt,
+    _has_project_imports,
+    visit_py_module,
+    visit_py_modules,
 )
 
 
-def test__compute_py_module_from_abs_import_from_stmt_all_modules(
-    tmp_path: Path,
-) -> None:
-    path = tmp_path / "path/to/package/a/b"
-    path.mkdir(parents=True, exist_ok=True)
-    (path / "__init__.py").touch()
-    (path / "c.py").touch()
-    (path / "d.py").touch()
+def test__compute_py_module_from_abs_import_from_stmt_all_modules() -> None:
+    # Only the module names are looked up, the files do not have to exist
+    package = Path("/path/to/package")
+    path = package / "a/b"
+    init = PyModule(package, path / "__init__.py", PyModuleType.REGULAR_PACKAGE)
+    c = PyModule(package, path / "c.py", PyModuleType.MODULE)
+    d = PyModule(package, path / "d.py", PyModuleType.MODULE)
+    py_modules_by_name: Mapping[ModuleName, PyModule] = {m.name: m for m in [init, c, d]}
+    assert list(
+        _compute_py_module_from_abs_import_from_stmt(
+            py_modules_by_name, _AbsImportFromStmt("package.a.b", ("c", "d"))
+        )
+    ) == [c, d]
 
-    py_modules_by_name: Mapping[ModuleName, PyModule] = {
-        m.name: m
-        for m in [
-            PyModule(tmp_path / "path/to/package", path / "__init__.py"),
-            PyModule(tmp_path / "path/to/package", path / "c.py"),
-            PyModule(tmp_path / "path/to/package", path / "d.py"),
-        ]
-    }
+
+def test__compute_py_module_from_abs_import_from_stmt_not_all_modules() -> None:
+    # Only the module names are looked up, the files do not have to exist
+    package = Path("/path/to/package")
+    path = package / "a/b"
+    init = PyModule(package, path / "__init__.py", PyModuleType.REGULAR_PACKAGE)
+    c = PyModule(package, path / "c.py", PyModuleType.MODULE)
+    py_modules_by_name: Mapping[ModuleName, PyModule] = {m.name: m for m in [init, c]}
     assert list(
         _compute_py_module_from_abs_import_from_stmt(
             py_modules_by_name, _AbsImportFromStmt("package.a.b", ("c", "d"))
         )
+    ) == [c, init]
+
+
+def test_visit_py_module_nested_imports(tmp_path: Path) -> None:
+    path = tmp_path / "path/to/package"
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "a.py").write_text(
+        "\n".join(
+            [
+                "import package.b",
+                "def f():",
+                "    from package import c",
+                "class C:",
+                "    if True:",
+                "        from . import d",
+            ]
+        )
+    )
+    for name in ("b", "c", "d"):
+        (path / f"{name}.py").touch()
+
+    py_modules_by_name: Mapping[ModuleName, PyModule] = {
+        m.name: m for m in [PyModule(path, path / f"{name}.py") for name in ("a", "b", "c", "d")]
+    }
+    py_modules_by_path: Mapping[str, PyModule] = {
+        str(m.path): m for m in py_modules_by_name.values()
+    }
+    assert sorted(
+        visit_py_module(
+            py_modules_by_name, py_modules_by_path, py_modules_by_name[ModuleName("package.a")]
+        )
     ) == [
-        PyModule(tmp_path / "path/to/package", path / "c.py"),
-        PyModule(tmp_path / "path/to/package", path / "d.py"),
+        PyModule(path, path / "b.py"),
+        PyModule(path, path / "c.py"),
+        PyModule(path, path / "d.py"),
     ]
 
 
-def test__compute_py_module_from_abs_import_from_stmt_not_all_modules(
-    tmp_path: Path,
-) -> None:
-    path = tmp_path / "path/to/package/a/b"
+def test_visit_py_module_duplicate_imports(tmp_path: Path) -> None:
+    path = tmp_path / "path/to/package"
     path.mkdir(parents=True, exist_ok=True)
-    (path / "__init__.py").touch()
-    (path / "c.py").touch()
+    (path / "a.py").write_text(
+        "\n".join(
+            [
+                "import package.b",
+                "from package.b import x",
+                "from package.b import y",
+                "from . import b",
+            ]
+        )
+    )
+    (path / "b.py").touch()
 
     py_modules_by_name: Mapping[ModuleName, PyModule] = {
-        m.name: m
-        for m in [
-            PyModule(tmp_path / "path/to/package", path / "__init__.py"),
-            PyModule(tmp_path / "path/to/package", path / "c.py"),
-        ]
+        m.name: m for m in [PyModule(path, path / f"{name}.py") for name in ("a", "b")]
+    }
+    py_modules_by_path: Mapping[str, PyModule] = {
+        str(m.path): m for m in py_modules_by_name.values()
     }
     assert list(
-        _compute_py_module_from_abs_import_from_stmt(
-            py_modules_by_name, _AbsImportFromStmt("package.a.b", ("c", "d"))
+        visit_py_module(
+            py_modules_by_name, py_modules_by_path, py_modules_by_name[ModuleName("package.a")]
         )
-    ) == [
-        PyModule(tmp_path / "path/to/package", path / "c.py"),
-        PyModule(tmp_path / "path/to/package", path / "__init__.py"),
-    ]
+    ) == [PyModule(path, path / "b.py")]
+
+
+def test_visit_py_module_encoding_declaration(tmp_path: Path) -> None:
+    path = tmp_path / "path/to/package"
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "a.py").write_bytes(
+        "# -*- coding: latin-1 -*-\nimport package.b\nname = 'J\u00fcrgen'\n".encode("latin-1")
+    )
+    (path / "b.py").touch()
+
+    py_modules_by_name: Mapping[ModuleName, PyModule] = {
+        m.name: m for m in [PyModule(path, path / f"{name}.py") for name in ("a", "b")]
+    }
+    py_modules_by_path: Mapping[str, PyModule] = {
+        str(m.path): m for m in py_modules_by_name.values()
+    }
+    assert list(
+        visit_py_module(
+            py_modules_by_name, py_modules_by_path, py_modules_by_name[ModuleName("package.a")]
+        )
+    ) == [PyModule(path, path / "b.py")]
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        (b"", False),
+        (b"print('hello world')", False),
+        (b"import os", False),
+        (b"import os.path as osp, sys", False),
+        (b"from collections.abc import Mapping", False),
+        (b"from __future__ import annotations", False),
+        (b"import package", True),
+        (b"import os, package.a", True),
+        (b"import os as package, sys", False),
+        (b"import os, \\\n    package", True),
+        (b"import\\\n    package", True),
+        (b"from package \\\n    import x", True),
+        (b"from \\\n    package import x", True),
+        (b"from package . a import x", True),
+        (b"from.a import b", True),
+        (b"from . . a import b", True),
+        (b"from package.a import b", True),
+        (b"from . import a", True),
+        (b"from .import a", True),
+        (b"from ..a import b", True),
+        (b"if True: import package", True),
+        ("import \u00e4, package".encode(), True),
+        ("from \u00e4 import package".encode(), False),
+    ],
+)
+def test__has_project_imports(content: bytes, expected: bool) -> None:
+    assert _has_project_imports({"package"}, content) is expected
+
+
+@pytest.mark.parametrize("min_py_modules_for_workers", [0, 20])
+def test_visit_py_modules(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, min_py_modules_for_workers: int
+) -> None:
+    monkeypatch.setattr(
+        "py_import_cycles.visitors._MIN_PY_MODULES_FOR_WORKERS", min_py_modules_for_workers
+    )
+    path = tmp_path / "path/to/package"
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "a.py").write_text("from . import b")
+    (path / "b.py").write_text("import os\nimport package.c")
+    (path / "c.py").write_text("import os")
+
+    py_modules = [PyModule(path, path), *(PyModule(path, path / f"{n}.py") for n in "abc")]
+    py_modules_by_name: Mapping[ModuleName, PyModule] = {m.name: m for m in py_modules}
+    py_modules_by_path: Mapping[str, PyModule] = {str(m.path): m for m in py_modules}
+    assert {
+        str(py_module): [str(m) for m in import_py_modules]
+        for py_module, import_py_modules in visit_py_modules(
+            py_modules_by_name, py_modules_by_path, py_modules
+        )
+    } == {
+        "package.a": ["package.b"],
+        "package.b": ["package.c"],
+        "package.c": [],
+    }
+
+
+def test_visit_py_modules_cache_folder(tmp_path: Path) -> None:
+    cache_folder = tmp_path / "cache"
+    cache_folder.mkdir()
+    path = tmp_path / "path/to/package"
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "a.py").write_text("from . import b")
+    (path / "b.py").write_text("import os")
+    (path / "c.py").touch()
+
+    py_modules = [PyModule(path, path / f"{n}.py") for n in "abc"]
+    py_modules_by_name: Mapping[ModuleName, PyModule] = {m.name: m for m in py_modules}
+    py_modules_by_path: Mapping[str, PyModule] = {str(m.path): m for m in py_modules}
+
+    def _visit() -> Mapping[str, Sequence[str]]:
+        return {
+            str(py_module): [str(m) for m in import_py_modules]
+            for py_module, import_py_modules in visit_py_modules(
+                py_modules_by_name, py_modules_by_path, py_modules, cache_folder
+            )
+        }
+
+    assert _visit() == {"package.a": ["package.b"], "package.b": [], "package.c": []}
+    assert len(list(cache_folder.iterdir())) == 3
+    assert _visit() == {"package.a": ["package.b"], "package.b": [], "package.c": []}
+
+    (path / "b.py").write_text("import package.c  # changed")
+    assert _visit() == {"package.a": ["package.b"], "package.b": ["package.c"], "package.c": []}
+
+
+def test__compute_cache_path_python_version(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    path = tmp_path / "a.py"
+    path.touch()
+    cache_path = _compute_cache_path(tmp_path, path, {"package"})
+    assert _compute_cache_path(tmp_path, path, {"package"}) == cache_path
+    monkeypatch.setattr("sys.version_info", (3, 99, 0, "final", 0))
+    assert _compute_cache_path(tmp_path, path, {"package"}) != cache_path
@@ -17,7 +17,8 @@ def fixture_root(tmp_path: Path) -> Path:
 
 def setup_py_module(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text("print('hello world')")
+    # The scan only looks at the names, the content does not matter
+    path.touch()
 
 
 def test_no_files(root: Path) -> None:
@@ -26,7 +27,7 @@ def test_no_files(root: Path) -> None:
 
     assert (
         frozenset(
-            [f for f in scan_packages([projdir]) if f.type is not PyModuleType.NAMESPACE_PACKAGE]
+            f for f in scan_packages([projdir]) if f.type is not PyModuleType.NAMESPACE_PACKAGE
         )
         == frozenset()
     )
@@ -39,7 +40,7 @@ def test_single_file(root: Path) -> None:
     setup_py_module(proj)
 
     assert frozenset(
-        [f for f in scan_packages([proj.parent]) if f.type is not PyModuleType.NAMESPACE_PACKAGE]
+        f for f in scan_packages([proj.parent]) if f.type is not PyModuleType.NAMESPACE_PACKAGE
     ) == {PyModule(package=proj.parent, path=proj)}
 
 
@@ -54,11 +55,9 @@ def test_multiple_files(root: Path) -> None:
         setup_py_module(p)
 
     assert frozenset(
-        [
-            f
-            for f in scan_packages([p.parent for p in proj])
-            if f.type is not PyModuleType.NAMESPACE_PACKAGE
-        ]
+        f
+        for f in scan_packages([p.parent for p in proj])
+        if f.type is not PyModuleType.NAMESPACE_PACKAGE
     ) == {PyModule(package=p.parent, path=p) for p in proj}
 
 
@@ -69,11 +68,9 @@ def test_multiple_file_with_excludes(root: Path) -> None:
         setup_py_module(p)
 
     assert frozenset(
-        [
-            f
-            for f in scan_packages([p.parent for p in proj])
-            if f.type is not PyModuleType.NAMESPACE_PACKAGE
-        ]
+        f
+        for f in scan_packages([p.parent for p in proj])
+        if f.type is not PyModuleType.NAMESPACE_PACKAGE
     ) == {PyModule(package=p.parent, path=p) for p in proj}
 
 
@@ -86,7 +83,7 @@ def test_ignore_files_without_py_extention(root: Path) -> None:
         setup_py_module(p)
 
     assert frozenset(
-        [f for f in scan_packages([projdir]) if f.type is not PyModuleType.NAMESPACE_PACKAGE]
+        f for f in scan_packages([projdir]) if f.type is not PyModuleType.NAMESPACE_PACKAGE
     ) == {PyModule(package=p.parent, path=p) for p in proj}
 
 
@@ -97,11 +94,9 @@ def test_ignore_extra_names_in_second_arg(root: Path) -> None:
         setup_py_module(p)
 
     assert frozenset(
-        [
-            f
-            for f in scan_packages([projdir, projdir / Path("extra"), projdir / Path("args")])
-            if f.type is not PyModuleType.NAMESPACE_PACKAGE
-        ]
+        f
+        for f in scan_packages([projdir, projdir / Path("extra"), projdir / Path("args")])
+        if f.type is not PyModuleType.NAMESPACE_PACKAGE
     ) == {PyModule(package=p.parent, path=p) for p in proj}
 
 
@@ -119,9 +114,49 @@ def test_recurse_dirs(root: Path) -> None:
         setup_py_module(p)
 
     assert frozenset(
-        [
-            f
-            for f in scan_packages([root / Path("p1"), root / Path("p2")])
-            if f.type is not PyModuleType.NAMESPACE_PACKAGE
-        ]
-    ) == {PyModule(package=p.parents[-7], path=p) for p in proj}
+        f
+        for f in scan_packages([root / Path("p1"), root / Path("p2")])
+        if f.type is not PyModuleType.NAMESPACE_PACKAGE
+    ) == {PyModule(package=root / p.relative_to(root).parts[0], path=p) for p in proj}
+
+
+def test_ignore_hidden_folders(root: Path) -> None:
+    projdir = root / "p"
+    proj = {projdir / "p1.py", projdir / "sub" / "p2.py"}
+    hidden = {projdir / ".hidden" / "p3.py", projdir / ".hidden" / "sub" / "p4.py"}
+    for p in proj | hidden:
+        setup_py_module(p)
+
+    assert frozenset(
+        f for f in scan_packages([projdir]) if f.type is not PyModuleType.NAMESPACE_PACKAGE
+    ) == {PyModule(package=projdir, path=p) for p in proj}
+
+
+def test_py_module_types(root: Path) -> None:
+    projdir = root / "p"
+    proj = {projdir / "__init__.py", projdir / "p1.py", projdir / "ns" / "sub" / "p2.py"}
+    for p in proj:
+        setup_py_module(p)
+
+    assert {(f.path, f.type) for f in scan_packages([projdir])} == {
+        (projdir / "__init__.py", PyModuleType.REGULAR_PACKAGE),
+        (projdir / "p1.py", PyModuleType.MODULE),
+        (projdir / "ns", PyModuleType.NAMESPACE_PACKAGE),
+        (projdir / "ns" / "sub", PyModuleType.NAMESPACE_PACKAGE),
+        (projdir / "ns" / "sub" / "p2.py", PyModuleType.MODULE),
+    }
+
+
+def test_skip_invalid_module_names(root: Path) -> None:
+    projdir = root / "p"
+    valid = {projdir / "p1.py", projdir / "sub" / "p2.py"}
+    invalid = {projdir / "__my-runner__.py", projdir / "my-dir" / "x.py"}
+    for p in valid | invalid:
+        setup_py_module(p)
+
+    assert {(f.path, f.type) for f in scan_packages([projdir])} == {
+        (projdir, PyModuleType.NAMESPACE_PACKAGE),
+        (projdir / "p1.py", PyModuleType.MODULE),
+        (projdir / "sub", PyModuleType.NAMESPACE_PACKAGE),
+        (projdir / "sub" / "p2.py", PyModuleType.MODULE),
+    }